@@ -17,48 +17,73 @@ class ControlBridge:
         # Snake movement rules
         self.last_move_direction = None
         
-    def update(self, head_position, keypoints):
+        # Head position seen by the last full update
+        self._last_head_position = None
+        
+    def update(self, head_position, keypoints, keypoints_valid):
         """
         Update control bridge with new head data
         
         Args:
             head_position: Current head position
-            keypoints: Head keypoints dictionary
+            keypoints: (N_KP, 2) keypoint array from the vision module, or None
+            keypoints_valid: uint8 validity mask for keypoints, or None
         """
+        # Nothing detected: no new direction, and neither gesture can be active
+        if head_position is None and keypoints is None:
+            self._update_direction(None)
+            self._update_boost(False)
+            self._update_pause(False)
+            return
+        
+        # Head hasn't moved and both gestures stay on cooldown through this frame's
+        # tick: neither can trigger, so skip the gesture analysis. The position
+        # history still advances, since the direction compares against it
+        recognizer = self.gesture_recognizer
+        if (head_position is not None and head_position == self._last_head_position and
+                recognizer.pause_cooldown > 1 and recognizer.boost_cooldown > 1):
+            recognizer.tick(head_position)
+            self._update_direction(recognizer.get_direction())
+            self.boost_active = False
+            return
+        self._last_head_position = head_position
+        
         # Update gesture recognizer
-        self.gesture_recognizer.update(head_position, keypoints)
+        self.gesture_recognizer.update(head_position, keypoints, keypoints_valid)
         
         # Get direction based on head movement
-        direction = self.gesture_recognizer.get_direction(keypoints)
+        direction = self.gesture_recognizer.get_direction()
         
-        # Check for gestures
-        is_open_palm = self.gesture_recognizer.is_open_palm(keypoints)
-        is_closed_fist = self.gesture_recognizer.is_closed_fist(keypoints)
-        
-        # Update controls
+        # Update controls (gestures were evaluated by the recognizer's update)
         self._update_direction(direction)
-        self._update_boost(is_open_palm)
-        self._update_pause(is_closed_fist)
+        self._update_boost(self.gesture_recognizer.is_open_palm())
+        self._update_pause(self.gesture_recognizer.is_closed_fist())
+    
+    def hold(self, head_position):
+        """
+        Advance one camera frame that brought no new detection
+        
+        Keeps the position history to fresh samples only, while cooldowns
+        still count camera frames; no gesture can trigger.
+        
+        Args:
+            head_position: Head position reused from the last detection, or None
+        """
+        if head_position is not None:
+            self.gesture_recognizer.tick_cooldowns()
+        self.boost_active = False
     
     def _update_direction(self, direction):
         """Update snake direction (prevent opposite moves)"""
         if direction is None:
             return
         
-        # Prevent opposite direction moves (snake rule)
-        opposite_map = {
-            'UP': 'DOWN',
-            'DOWN': 'UP',
-            'LEFT': 'RIGHT',
-            'RIGHT': 'LEFT'
-        }
-        
         if self.last_move_direction is None:
             # First move - allow any direction
             self.current_direction = direction
             self.last_move_direction = direction
-        elif direction != opposite_map.get(self.last_move_direction):
-            # Only update if not opposite direction
+        elif direction != self.last_move_direction ^ 1:
+            # Prevent opposite direction moves (snake rule)
             self.current_direction = direction
             self.last_move_direction = direction
     
@@ -78,7 +103,7 @@ class ControlBridge:
             self.pause_triggered = False
     
     def get_direction(self):
-        """Get current direction command"""
+        """Get current direction command (game direction id or None)"""
         return self.current_direction
     
     def get_boost(self):
@@ -107,4 +132,5 @@ class ControlBridge:
         self.boost_active = False
         self.pause_triggered = False
         self.last_move_direction = None
+        self._last_head_position = None
 
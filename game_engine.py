@@ -4,6 +4,72 @@ Game Engine: Snake game logic
 import random
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional: without it the step kernel runs as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Directions are small ints so lookups are tuple indexing instead of dict hashing.
+# Opposites differ only in the lowest bit: the opposite of d is d ^ 1.
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+DIRECTION_NAMES = ('UP', 'DOWN', 'LEFT', 'RIGHT')
+_DXY = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+
+@njit(cache=True)
+def _step(sx, sy, head, length, occupied, grid_width, grid_height, dx, dy, food_x, food_y):
+    """
+    Advance the snake one cell in its ring buffers
+    
+    The body is stored head to tail at ring slots head, head - 1, ...,
+    head - length + 1 (modulo the ring capacity).
+    
+    Returns:
+        tuple: (head, length, ate, game_over)
+    """
+    capacity = sx.shape[0]
+    new_x = int(sx[head]) + dx
+    new_y = int(sy[head]) + dy
+    
+    # Check wall collision
+    if new_x < 0 or new_x >= grid_width or new_y < 0 or new_y >= grid_height:
+        return head, length, False, True
+    
+    # Check self collision
+    cell = new_y * grid_width + new_x
+    if occupied[cell]:
+        return head, length, False, True
+    
+    # Add new head
+    head = (head + 1) % capacity
+    sx[head] = new_x
+    sy[head] = new_y
+    occupied[cell] = 1
+    
+    # Check food collision
+    if new_x == food_x and new_y == food_y:
+        return head, length + 1, True, False
+    
+    # Remove tail if no food eaten
+    tail = (head - length) % capacity
+    occupied[int(sy[tail]) * grid_width + int(sx[tail])] = 0
+    return head, length, False, False
+
+
+@njit(cache=True)
+def _nth_free_cell(occupied, n):
+    """Return the index of the n-th (0-based) unoccupied cell, or -1 if there is none"""
+    for i in range(occupied.shape[0]):
+        if not occupied[i]:
+            if n == 0:
+                return i
+            n -= 1
+    return -1
+
 
 class SnakeGame:
     def __init__(self, grid_width=20, grid_height=20, cell_size=20):
@@ -19,6 +85,11 @@ class SnakeGame:
         self.grid_height = grid_height
         self.cell_size = cell_size
         
+        # Compile the kernels now rather than on the first move
+        _step(np.zeros(2, dtype=np.int16), np.zeros(2, dtype=np.int16), 0, 1,
+              np.zeros(4, dtype=np.uint8), 2, 2, 1, 0, -1, -1)
+        _nth_free_cell(np.zeros(4, dtype=np.uint8), 0)
+        
         # Game state
         self.reset()
         
@@ -33,14 +104,23 @@ class SnakeGame:
         center_x = self.grid_width // 2
         center_y = self.grid_height // 2
         
-        self.snake = [
-            (center_x, center_y),
-            (center_x - 1, center_y),
-            (center_x - 2, center_y)
-        ]
-        
-        self.direction = 'RIGHT'
-        self.next_direction = 'RIGHT'
+        # Snake body as SoA ring buffers sized to the whole board, written tail first
+        capacity = self.grid_width * self.grid_height
+        self._sx = np.empty(capacity, dtype=np.int16)
+        self._sy = np.empty(capacity, dtype=np.int16)
+        self._sx[:3] = (center_x - 2, center_x - 1, center_x)
+        self._sy[:3] = center_y
+        self._head = 2
+        self._length = 3
+        self._ring_offsets = np.arange(capacity)
+        
+        # Occupancy grid mirroring the snake body (index = y * grid_width + x)
+        self._occupied = np.zeros(capacity, dtype=np.uint8)
+        self._occupied[center_y * self.grid_width + center_x - 2:
+                       center_y * self.grid_width + center_x + 1] = 1
+        
+        self.direction = RIGHT
+        self.next_direction = RIGHT
         self.score = 0
         self.game_over = False
         self.paused = False
@@ -53,7 +133,7 @@ class SnakeGame:
         Update game state
         
         Args:
-            direction_command: Direction from control bridge ('UP', 'DOWN', 'LEFT', 'RIGHT')
+            direction_command: Direction from control bridge (UP, DOWN, LEFT, RIGHT) or None
             boost_active: Whether boost is active
         """
         if self.game_over or self.paused:
@@ -61,14 +141,8 @@ class SnakeGame:
         
         # Update direction if valid
         if direction_command is not None:
-            opposite = {
-                'UP': 'DOWN',
-                'DOWN': 'UP',
-                'LEFT': 'RIGHT',
-                'RIGHT': 'LEFT'
-            }
             # Prevent opposite direction
-            if direction_command != opposite.get(self.direction):
+            if direction_command != self.direction ^ 1:
                 self.next_direction = direction_command
         
         # Determine speed
@@ -85,50 +159,29 @@ class SnakeGame:
         # Update direction
         self.direction = self.next_direction
         
-        # Calculate new head position
-        head_x, head_y = self.snake[0]
+        # Move snake in its ring buffers
+        dx, dy = _DXY[self.direction]
+        food_x, food_y = self.food
+        self._head, self._length, ate, self.game_over = _step(
+            self._sx, self._sy, self._head, self._length, self._occupied,
+            self.grid_width, self.grid_height, dx, dy, food_x, food_y)
         
-        direction_map = {
-            'UP': (0, -1),
-            'DOWN': (0, 1),
-            'LEFT': (-1, 0),
-            'RIGHT': (1, 0)
-        }
-        
-        dx, dy = direction_map[self.direction]
-        new_head = (head_x + dx, head_y + dy)
-        
-        # Check wall collision
-        if (new_head[0] < 0 or new_head[0] >= self.grid_width or
-            new_head[1] < 0 or new_head[1] >= self.grid_height):
-            self.game_over = True
-            return
-        
-        # Check self collision
-        if new_head in self.snake:
-            self.game_over = True
-            return
-        
-        # Add new head
-        self.snake.insert(0, new_head)
-        
-        # Check food collision
-        if new_head == self.food:
+        if ate:
             self.score += 10
             self.food = self._spawn_food()
-        else:
-            # Remove tail if no food eaten
-            self.snake.pop()
+            if self.food is None:
+                # Snake fills the whole board
+                self.game_over = True
     
     def _spawn_food(self):
-        """Spawn food at random location (not on snake)"""
-        while True:
-            food_x = random.randint(0, self.grid_width - 1)
-            food_y = random.randint(0, self.grid_height - 1)
-            food_pos = (food_x, food_y)
-            
-            if food_pos not in self.snake:
-                return food_pos
+        """Spawn food at random location (not on snake), or None if board is full"""
+        free_count = len(self._occupied) - self._length
+        if free_count <= 0:
+            return None
+        
+        # Pick uniformly among free cells, then find that cell in the occupancy grid
+        index = _nth_free_cell(self._occupied, random.randrange(free_count))
+        return (index % self.grid_width, index // self.grid_width)
     
     def toggle_pause(self):
         """Toggle pause state"""
@@ -136,8 +189,13 @@ class SnakeGame:
             self.paused = not self.paused
     
     def get_snake(self):
-        """Get snake body positions"""
-        return self.snake
+        """Get snake body positions, head first"""
+        return [tuple(segment) for segment in self.get_snake_array().tolist()]
+    
+    def get_snake_array(self):
+        """Get snake body positions, head first, as a contiguous (length, 2) int16 array"""
+        ring = (self._head - self._ring_offsets[:self._length]) % len(self._sx)
+        return np.stack((self._sx[ring], self._sy[ring]), axis=1)
     
     def get_food(self):
         """Get food position"""
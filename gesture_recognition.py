@@ -1,11 +1,19 @@
 """
 Gesture Recognition Module: Analyzes hand movements and gestures
 """
+import math
 import numpy as np
-from collections import deque
+from keypoints import KP_WRIST, KP_THUMB, KP_PINKY
+from game_engine import UP, DOWN, LEFT, RIGHT
+
+# Direction by (vertical axis * 2 + positive sign)
+_DIR_TABLE = (LEFT, RIGHT, UP, DOWN)
 
 
 class GestureRecognition:
+    # Fingertip rows of the keypoint array (thumb to pinky)
+    FINGER_TIPS = range(KP_THUMB, KP_PINKY + 1)
+    
     def __init__(self, movement_threshold=30, history_size=10):
         """
         Initialize gesture recognition
@@ -17,8 +25,11 @@ class GestureRecognition:
         self.movement_threshold = movement_threshold
         self.history_size = history_size
         
-        # Position history for movement tracking
-        self.position_history = deque(maxlen=history_size)
+        # Position history for movement tracking: preallocated ring buffer
+        # (_hist_i is the next write slot, _hist_n the number of valid rows)
+        self._hist = np.empty((history_size, 2), dtype=np.int32)
+        self._hist_i = 0
+        self._hist_n = 0
         
         # Calibration
         self.neutral_position = None
@@ -32,6 +43,10 @@ class GestureRecognition:
         self.pause_cooldown = 0
         self.boost_cooldown = 0
         
+        # Gesture results for the current frame, computed once in update()
+        self._cached_open = False
+        self._cached_fist = False
+        
     def calibrate(self, head_position):
         """
         Set neutral position for calibration
@@ -42,25 +57,42 @@ class GestureRecognition:
         if head_position is not None:
             self.neutral_position = head_position
             self.is_calibrated = True
-            self.position_history.clear()
-            self.position_history.append(head_position)
+            self._clear_history()
+            self._push_position(head_position)
             print("Calibration complete!")
     
-    def update(self, head_position, keypoints):
+    def update(self, head_position, keypoints, keypoints_valid):
         """
         Update gesture recognition with new head data
         
         Args:
             head_position: Current head position (x, y) - nose position
-            keypoints: Dictionary of head keypoints
+            keypoints: (N_KP, 2) keypoint array, or None
+            keypoints_valid: uint8 validity mask for keypoints, or None
         """
+        # Evaluate hand gestures once per frame
+        self._cached_open, self._cached_fist = self._analyze(keypoints, keypoints_valid)
+        
         if head_position is None:
             return
         
+        self.tick(head_position)
+    
+    def tick(self, head_position):
+        """
+        Advance position history and cooldowns by one frame without evaluating gestures
+        
+        Args:
+            head_position: Current head position (x, y) - nose position
+        """
         # Add to history
-        self.position_history.append(head_position)
+        self._push_position(head_position)
         
         # Update cooldowns
+        self.tick_cooldowns()
+    
+    def tick_cooldowns(self):
+        """Advance pause and boost cooldowns by one frame"""
         if self.pause_cooldown > 0:
             self.pause_cooldown -= 1
         if self.boost_cooldown > 0:
@@ -71,144 +103,102 @@ class GestureRecognition:
         Determine movement direction based on head movement
         
         Args:
-            keypoints: Dictionary of head keypoints (head/nose position)
+            keypoints: Keypoint array (unused; direction comes from position history)
         
         Returns:
-            str: 'UP', 'DOWN', 'LEFT', 'RIGHT', or None
+            int: Game direction id (UP, DOWN, LEFT, RIGHT), or None
         """
-        if len(self.position_history) < 3:
+        if self._hist_n < 3:
             return None
         
-        # Compare recent head position to older position
-        recent = np.array(self.position_history[-1])
-        older = np.array(self.position_history[0])
-        
-        movement = recent - older
+        # Compare recent head position to older position (plain scalars, no arrays)
+        recent_x, recent_y = self._hist[(self._hist_i - 1) % self.history_size].tolist()
+        oldest = self._hist_i % self.history_size if self._hist_n == self.history_size else 0
+        older_x, older_y = self._hist[oldest].tolist()
         
         # Calculate movement magnitude
-        dx = movement[0]
-        dy = movement[1]
-        
-        # Determine dominant direction
-        if abs(dx) > abs(dy):
-            # Horizontal movement
-            if abs(dx) < self.movement_threshold:
-                return None
-            if dx > 0:
-                direction = 'RIGHT'
-            else:
-                direction = 'LEFT'
-        else:
-            # Vertical movement
-            if abs(dy) < self.movement_threshold:
-                return None
-            if dy > 0:
-                direction = 'DOWN'
-            else:
-                direction = 'UP'
+        dx = recent_x - older_x
+        dy = recent_y - older_y
+        abs_dx = abs(dx)
+        abs_dy = abs(dy)
+        
+        # Barely moved: no axis can reach the threshold, skip the axis logic
+        if abs_dx + abs_dy < self.movement_threshold / 2:
+            return None
+        
+        # Determine dominant direction: pick the axis, then index the table by sign
+        horizontal = abs_dx > abs_dy
+        if (abs_dx if horizontal else abs_dy) < self.movement_threshold:
+            return None
+        direction = _DIR_TABLE[(0 if horizontal else 2) + ((dx if horizontal else dy) > 0)]
         
         self.last_direction = self.current_direction
         self.current_direction = direction
         
         return direction
     
-    def is_open_palm(self, keypoints):
-        """
-        Detect if hand is open (palm spread)
-        
-        Args:
-            keypoints: Dictionary of hand keypoints
-            
-        Returns:
-            bool: True if open palm detected
-        """
-        if keypoints is None:
-            return False
-        
-        # Check if we have enough keypoints
-        finger_tips = ['thumb', 'index', 'middle', 'ring', 'pinky']
-        valid_fingers = [kp for kp in finger_tips if keypoints.get(kp) is not None]
-        
-        if len(valid_fingers) < 3:
-            return False
-        
-        # Calculate distances between fingertips
-        wrist = keypoints.get('wrist')
-        if wrist is None:
-            return False
-        
-        finger_positions = []
-        for finger in valid_fingers:
-            if keypoints[finger] is not None:
-                finger_positions.append(keypoints[finger])
-        
-        if len(finger_positions) < 3:
-            return False
-        
-        # Calculate average distance from wrist to fingertips
-        distances = []
-        for finger_pos in finger_positions:
-            dist = np.sqrt((finger_pos[0] - wrist[0])**2 + (finger_pos[1] - wrist[1])**2)
-            distances.append(dist)
-        
-        avg_distance = np.mean(distances)
-        
-        # Calculate spread between fingertips
-        if len(finger_positions) >= 3:
-            # Distance between index and pinky (hand width)
-            index_pinky_dist = np.sqrt(
-                (finger_positions[0][0] - finger_positions[-1][0])**2 +
-                (finger_positions[0][1] - finger_positions[-1][1])**2
-            )
-            
-            # Open palm: fingers spread wide and extended
-            # Threshold: average finger distance > 40 pixels and spread > 50 pixels
-            return avg_distance > 40 and index_pinky_dist > 50
-        
-        return False
+    def is_open_palm(self):
+        """Whether the last update() saw an open palm"""
+        return self._cached_open
+    
+    def is_closed_fist(self):
+        """Whether the last update() saw a closed fist"""
+        return self._cached_fist
     
-    def is_closed_fist(self, keypoints):
+    def _analyze(self, keypoints, keypoints_valid):
         """
-        Detect if hand is closed (fist)
+        Detect open palm and closed fist in one pass over the fingertips
         
         Args:
-            keypoints: Dictionary of hand keypoints
+            keypoints: (N_KP, 2) keypoint array, or None
+            keypoints_valid: uint8 validity mask for keypoints, or None
             
         Returns:
-            bool: True if closed fist detected
+            tuple: (is_open_palm, is_closed_fist)
         """
         if keypoints is None:
-            return False
-        
-        wrist = keypoints.get('wrist')
-        if wrist is None:
-            return False
-        
-        # Check finger positions relative to wrist
-        finger_tips = ['thumb', 'index', 'middle', 'ring', 'pinky']
-        valid_fingers = [kp for kp in finger_tips if keypoints.get(kp) is not None]
+            return False, False
         
-        if len(valid_fingers) < 3:
-            return False
+        # Both gestures need the wrist and at least three fingertips
+        valid = keypoints_valid.tolist()
+        if not valid[KP_WRIST]:
+            return False, False
         
-        # Calculate distances from wrist to fingertips
-        distances = []
-        for finger in valid_fingers:
-            if keypoints[finger] is not None:
-                dist = np.sqrt(
-                    (keypoints[finger][0] - wrist[0])**2 +
-                    (keypoints[finger][1] - wrist[1])**2
-                )
-                distances.append(dist)
+        tips = [i for i in self.FINGER_TIPS if valid[i]]
+        if len(tips) < 3:
+            return False, False
         
-        if len(distances) == 0:
-            return False
+        # A handful of points: plain floats and math beat per-call numpy overhead
+        pts = keypoints.tolist()
+        wrist_x, wrist_y = pts[KP_WRIST]
         
-        avg_distance = np.mean(distances)
+        # Average distance from wrist to fingertips, shared by both gestures
+        avg_distance = sum(math.hypot(pts[i][0] - wrist_x, pts[i][1] - wrist_y) for i in tips) / len(tips)
         
         # Closed fist: fingertips close to wrist
         # Threshold: average distance < 30 pixels
-        return avg_distance < 30
+        if avg_distance < 30:
+            return False, True
+        
+        # Spread between first and last fingertip (hand width), squared
+        spread_x = pts[tips[0]][0] - pts[tips[-1]][0]
+        spread_y = pts[tips[0]][1] - pts[tips[-1]][1]
+        
+        # Open palm: fingers spread wide and extended
+        # Threshold: average finger distance > 40 pixels and spread > 50 pixels
+        is_open = avg_distance > 40 and spread_x * spread_x + spread_y * spread_y > 50 * 50
+        return is_open, False
+    
+    def _push_position(self, head_position):
+        """Write a position into the history ring, overwriting the oldest"""
+        self._hist[self._hist_i % self.history_size] = head_position
+        self._hist_i += 1
+        self._hist_n = min(self._hist_n + 1, self.history_size)
+    
+    def _clear_history(self):
+        """Empty the history ring without reallocating it"""
+        self._hist_i = 0
+        self._hist_n = 0
     
     def trigger_pause(self):
         """Trigger pause gesture (with cooldown)"""
@@ -226,9 +216,11 @@ class GestureRecognition:
     
     def reset(self):
         """Reset gesture recognition state"""
-        self.position_history.clear()
+        self._clear_history()
         self.current_direction = None
         self.last_direction = None
         self.is_calibrated = False
         self.neutral_position = None
+        self._cached_open = False
+        self._cached_fist = False
 
@@ -0,0 +1,18 @@
+"""
+Keypoints: Fixed keypoint array layout shared by vision and gesture recognition
+"""
+
+# Row indices into the (N_KP, 2) float32 keypoint array. Each row has a
+# matching entry in a uint8 validity mask (1 = detected this frame).
+# The hand rows are reserved for a hand model; the pose model only fills
+# the head rows.
+KP_WRIST = 0
+KP_THUMB = 1
+KP_INDEX = 2
+KP_MIDDLE = 3
+KP_RING = 4
+KP_PINKY = 5
+KP_NOSE = 6
+KP_LEFT_EYE = 7
+KP_RIGHT_EYE = 8
+N_KP = 9
@@ -41,14 +41,19 @@ class GameController:
         
         last_countdown = 3
         
+        # get_frame doesn't wait for the camera, so cap the loop at the camera rate
+        clock = pygame.time.Clock()
+        
         while time.time() - calibration_start < calibration_duration:
+            clock.tick(30)
+            
             # Get frame
             frame = self.vision.get_frame()
             if frame is None:
                 continue
             
             # Detect hand (returns annotated frame)
-            wrist_pos, keypoints, confidence, annotated_frame = self.vision.detect_hand(frame)
+            wrist_pos, keypoints, keypoints_valid, confidence, annotated_frame = self.vision.detect_hand(frame)
             
             # Update countdown display
             elapsed = time.time() - calibration_start
@@ -60,7 +65,8 @@ class GameController:
                 last_countdown = current_countdown
             
             # Draw calibration screen with annotated frame
-            self.ui.draw_calibration(annotated_frame if annotated_frame is not None else frame, current_countdown)
+            self.ui.draw_calibration(annotated_frame if annotated_frame is not None else frame,
+                                     current_countdown, wrist_pos)
             
             # Check for quit
             if not self.ui.handle_events():
@@ -68,7 +74,7 @@ class GameController:
         
         # Final calibration
         frame = self.vision.get_frame()
-        wrist_pos, keypoints, confidence, annotated_frame = self.vision.detect_hand(frame)
+        wrist_pos, keypoints, keypoints_valid, confidence, annotated_frame = self.vision.detect_hand(frame)
         
         if wrist_pos is not None:
             self.control_bridge.calibrate(wrist_pos)
@@ -93,21 +99,30 @@ class GameController:
         print("  - Open palm: Speed boost")
         print("  - Closed fist: Pause/Unpause")
         
+        last_frame = None
+        
         while self.running:
             # Handle events
             if not self.ui.handle_events():
                 break
             
-            # Get camera frame
+            # Get camera frame; the game steps once per new camera frame, since
+            # speeds and cooldowns are counted in camera frames
             frame = self.vision.get_frame()
-            if frame is None:
+            if frame is None or frame is last_frame:
+                clock.tick(FPS)
                 continue
+            last_frame = frame
             
-            # Detect head (returns annotated frame with boxes and keypoints)
-            head_pos, keypoints, confidence, annotated_frame = self.vision.detect_hand(frame)
+            # Detect head (returns annotated frame with boxes and keypoints;
+            # the vision module reuses its last detection on skipped frames)
+            head_pos, keypoints, keypoints_valid, confidence, annotated_frame = self.vision.detect_hand(frame)
             
-            # Update control bridge
-            self.control_bridge.update(head_pos, keypoints)
+            # Update control bridge; reused detections must not enter the gesture history
+            if self.vision.is_detection_fresh():
+                self.control_bridge.update(head_pos, keypoints, keypoints_valid)
+            else:
+                self.control_bridge.hold(head_pos)
             
             # Get control commands
             direction = self.control_bridge.get_direction()
@@ -122,11 +137,6 @@ class GameController:
             if not self.game.is_paused():
                 self.game.update(direction, boost_active)
             
-            # Check for restart (space key or game over + gesture)
-            if self.game.is_game_over():
-                # Could add gesture-based restart here
-                pass
-            
             # Draw everything with live camera feed
             self.ui.draw_game(
                 self.game,
@@ -138,11 +148,12 @@ class GameController:
                 annotated_frame
             )
             
-            # Handle keyboard restart
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_SPACE] and self.game.is_game_over():
-                self.game.reset()
-                self.control_bridge.reset()
+            # Handle keyboard restart (only poll the keyboard once the game is over)
+            if self.game.is_game_over():
+                # Could add gesture-based restart here
+                if pygame.key.get_pressed()[pygame.K_SPACE]:
+                    self.game.reset()
+                    self.control_bridge.reset()
             
             # Maintain FPS
             clock.tick(FPS)
@@ -4,6 +4,7 @@ UI Module: Pygame rendering and display
 import pygame
 import cv2
 import numpy as np
+from game_engine import DIRECTION_NAMES
 
 
 class UIModule:
@@ -42,6 +43,107 @@ class UIModule:
         self.camera_preview_size = (240, 180)  # Smaller to fit better
         self.camera_preview_pos = (self.window_width - 250, 10)  # Top-right corner
         
+        # Preallocated resize / color-convert destinations for the camera views.
+        # Both view sizes are fixed for the lifetime of the window.
+        preview_w, preview_h = self.camera_preview_size
+        self._preview_resized = np.empty((preview_h, preview_w, 3), dtype=np.uint8)
+        self._preview_rgb = np.empty_like(self._preview_resized)
+        self.calibration_size = (640, 480)
+        self._calib_resized = np.empty((480, 640, 3), dtype=np.uint8)
+        self._calib_rgb = np.empty_like(self._calib_resized)
+        
+        # Rendered text surfaces keyed by (font, text, color), least recently used first
+        self._text_cache = {}
+        self._text_cache_size = 64
+        
+        # Semi-transparent text backgrounds keyed by size
+        self._text_bg_cache = {}
+        
+        # Dirty-rect state: HUD text rects drawn last frame, and whether the
+        # next frame must clear and flip the whole window
+        self._hud_rects = []
+        self._needs_full_redraw = True
+        
+        # Snake and food cell surfaces, built for the game's cell size on first draw
+        self._cell_size = None
+        self._head_surf = None
+        self._body_surf = None
+        self._food_surf = None
+        
+        # Static text, rendered once and converted to the display's pixel format
+        self._head_detected_surf = self.font_small.render("HEAD DETECTED", True, self.GREEN).convert_alpha()
+        self._no_head_surf = self.font_small.render("NO HEAD", True, self.RED).convert_alpha()
+        self._camera_error_surf = self.font_small.render("Camera Error", True, self.RED).convert_alpha()
+        self._boost_surf = self.font_small.render("BOOST ACTIVE!", True, self.RED).convert_alpha()
+        self._pause_surf = self.font_large.render("PAUSED", True, self.WHITE).convert_alpha()
+        self._pause_hint_surf = self.font_small.render("Close your fist to unpause", True, self.GRAY).convert_alpha()
+        self._game_over_surf = self.font_large.render("GAME OVER", True, self.RED).convert_alpha()
+        self._restart_surf = self.font_small.render("Press SPACE to restart", True, self.GRAY).convert_alpha()
+        self._calib_surf = self.font_large.render("CALIBRATION", True, self.WHITE).convert_alpha()
+        self._calib_hint_surf = self.font_medium.render(
+            "Hold your hand still in front of the camera", True, self.YELLOW).convert_alpha()
+        
+        # Status backgrounds for the two fixed detection messages
+        self._head_detected_bg = self._text_bg(self._head_detected_surf)
+        self._no_head_bg = self._text_bg(self._no_head_surf)
+        
+        # Full-screen overlays with their static text, laid out once as blit lists
+        center_x, center_y = self.window_width // 2, self.window_height // 2
+        self._pause_overlay = self._compose_overlay(128, [
+            (self._pause_surf, (center_x, center_y)),
+            (self._pause_hint_surf, (center_x, center_y + 50)),
+        ])
+        self._game_over_overlay = self._compose_overlay(200, [
+            (self._game_over_surf, (center_x, center_y - 50)),
+            (self._restart_surf, (center_x, center_y + 50)),
+        ])
+        
+    def _render_cached(self, font, text, color):
+        """Render text through a small LRU cache of surfaces"""
+        key = (font, text, color)
+        surface = self._text_cache.pop(key, None)
+        if surface is None:
+            surface = font.render(text, True, color).convert_alpha()
+            if len(self._text_cache) >= self._text_cache_size:
+                # Evict the least recently used entry (dicts keep insertion order)
+                del self._text_cache[next(iter(self._text_cache))]
+        self._text_cache[key] = surface
+        return surface
+    
+    def _compose_overlay(self, alpha, texts):
+        """
+        Build the blit list for a full-screen overlay: a translucent black
+        dim layer followed by its text
+        
+        The dim layer uses surface alpha, which blends much faster than a
+        per-pixel alpha surface with the text baked in.
+        
+        Args:
+            alpha: Opacity of the black dim layer (0-255)
+            texts: List of (text_surface, center) pairs
+            
+        Returns:
+            list: (surface, position) pairs for Surface.blits
+        """
+        dim = pygame.Surface((self.window_width, self.window_height)).convert()
+        dim.set_alpha(alpha)
+        dim.fill(self.BLACK)
+        overlay = [(dim, (0, 0))]
+        for text_surface, center in texts:
+            overlay.append((text_surface, text_surface.get_rect(center=center)))
+        return overlay
+    
+    def _text_bg(self, text_surface):
+        """Get the semi-transparent black background sized for a text surface"""
+        size = (text_surface.get_width() + 10, text_surface.get_height() + 4)
+        text_bg = self._text_bg_cache.get(size)
+        if text_bg is None:
+            text_bg = pygame.Surface(size).convert()
+            text_bg.set_alpha(180)
+            text_bg.fill(self.BLACK)
+            self._text_bg_cache[size] = text_bg
+        return text_bg
+        
     def draw_game(self, game, head_pos, keypoints, confidence, direction, boost_active, camera_frame=None):
         """
         Draw game screen
@@ -49,25 +151,39 @@ class UIModule:
         Args:
             game: SnakeGame instance
             head_pos: Current head position
-            keypoints: Head keypoints dictionary
+            keypoints: Head keypoints array
             confidence: Detection confidence
             direction: Current direction
             boost_active: Whether boost is active
             camera_frame: Annotated camera frame from OpenCV
         """
-        # Clear screen
-        self.screen.fill(self.BLACK)
+        # Full-screen overlays dim everything, so those frames (and the first
+        # frame after one) clear and flip the whole window
+        overlay_active = game.is_paused() or game.is_game_over()
+        full_redraw = self._needs_full_redraw or overlay_active
+        
+        # Clear screen; otherwise only last frame's HUD text needs clearing,
+        # the board and preview backgrounds repaint their own areas
+        if full_redraw:
+            self.screen.fill(self.BLACK)
+        else:
+            for rect in self._hud_rects:
+                self.screen.fill(self.BLACK, rect)
         
         # Draw game board
-        self._draw_game_board(game)
+        board_rect = self._draw_game_board(game)
         
         # Draw camera preview with live feed
-        self._draw_camera_preview(head_pos, keypoints, confidence, camera_frame)
+        preview_rect = self._draw_camera_preview(head_pos, keypoints, confidence, camera_frame)
         
         # Draw UI elements
-        self._draw_score(game.get_score())
-        self._draw_direction_indicator(direction)
-        self._draw_boost_indicator(boost_active)
+        hud_rects = [self._draw_score(game.get_score())]
+        dir_rect = self._draw_direction_indicator(direction)
+        if dir_rect is not None:
+            hud_rects.append(dir_rect)
+        boost_rect = self._draw_boost_indicator(boost_active)
+        if boost_rect is not None:
+            hud_rects.append(boost_rect)
         
         # Draw pause overlay
         if game.is_paused():
@@ -78,10 +194,15 @@ class UIModule:
             self._draw_game_over_overlay(game.get_score())
         
         # Update display
-        pygame.display.flip()
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update([board_rect, preview_rect] + self._hud_rects + hud_rects)
+        self._hud_rects = hud_rects
+        self._needs_full_redraw = overlay_active
     
     def _draw_game_board(self, game):
-        """Draw snake and food on game board"""
+        """Draw snake and food on game board; returns the board's screen rect"""
         grid_width, grid_height = game.get_grid_size()
         cell_size = game.get_cell_size()
         
@@ -93,153 +214,162 @@ class UIModule:
         board_y = (self.window_height - board_height) // 2 + 30
         
         # Draw board background
-        pygame.draw.rect(self.screen, (20, 20, 20), 
-                        (board_x - 5, board_y - 5, board_width + 10, board_height + 10))
-        
-        # Draw snake
-        snake = game.get_snake()
-        for i, segment in enumerate(snake):
-            x = board_x + segment[0] * cell_size
-            y = board_y + segment[1] * cell_size
+        board_rect = pygame.draw.rect(self.screen, (20, 20, 20),
+                                      (board_x - 5, board_y - 5, board_width + 10, board_height + 10))
+        
+        # Cell surfaces are only rebuilt when the cell size changes
+        if cell_size != self._cell_size:
+            self._build_cell_surfaces(cell_size)
+        
+        # Draw snake (cell grid -> pixel coordinates in one broadcast, one batched blit)
+        snake = game.get_snake_array()
+        if len(snake) > 0:
+            pixels = (snake * cell_size + (board_x, board_y)).tolist()
             
             # Head is brighter
-            color = self.GREEN if i == 0 else self.DARK_GREEN
-            pygame.draw.rect(self.screen, color, (x, y, cell_size - 2, cell_size - 2))
+            blit_list = [(self._head_surf, pixels[0])]
+            body_surf = self._body_surf
+            blit_list += [(body_surf, pos) for pos in pixels[1:]]
+            self.screen.blits(blit_list, doreturn=False)
         
         # Draw food
         food = game.get_food()
-        food_x = board_x + food[0] * cell_size
-        food_y = board_y + food[1] * cell_size
-        pygame.draw.circle(self.screen, self.RED, 
-                          (food_x + cell_size // 2, food_y + cell_size // 2),
-                          cell_size // 2 - 2)
+        if food is not None:
+            self.screen.blit(self._food_surf, (board_x + food[0] * cell_size,
+                                               board_y + food[1] * cell_size))
+        
+        return board_rect
+    
+    def _build_cell_surfaces(self, cell_size):
+        """Pre-render the snake head, snake body and food cells for cell_size"""
+        segment_size = (cell_size - 2, cell_size - 2)
+        self._head_surf = pygame.Surface(segment_size).convert()
+        self._head_surf.fill(self.GREEN)
+        self._body_surf = pygame.Surface(segment_size).convert()
+        self._body_surf.fill(self.DARK_GREEN)
+        
+        # Food circle on a color-keyed cell so only the circle is blitted
+        self._food_surf = pygame.Surface((cell_size, cell_size)).convert()
+        self._food_surf.fill(self.BLACK)
+        self._food_surf.set_colorkey(self.BLACK)
+        pygame.draw.circle(self._food_surf, self.RED, (cell_size // 2, cell_size // 2),
+                           cell_size // 2 - 2)
+        self._cell_size = cell_size
     
     def _draw_camera_preview(self, head_pos, keypoints, confidence, camera_frame=None):
-        """Draw camera preview with live feed and head tracking"""
+        """Draw camera preview with live feed and head tracking; returns the preview's screen rect"""
         preview_x, preview_y = self.camera_preview_pos
         preview_w, preview_h = self.camera_preview_size
         
         # Draw preview background
-        pygame.draw.rect(self.screen, (30, 30, 30),
-                        (preview_x, preview_y, preview_w, preview_h))
+        preview_rect = pygame.draw.rect(self.screen, (30, 30, 30),
+                                        (preview_x, preview_y, preview_w, preview_h))
         
         # Display live camera feed if available
         if camera_frame is not None:
             try:
-                # Resize frame to fit preview
-                frame_resized = cv2.resize(camera_frame, (preview_w, preview_h))
+                # Resize frame to fit preview (nearest neighbour is plenty for a thumbnail)
+                cv2.resize(camera_frame, (preview_w, preview_h), dst=self._preview_resized,
+                           interpolation=cv2.INTER_NEAREST)
                 # Convert BGR to RGB for Pygame
-                frame_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
-                # Convert to Pygame surface
-                frame_surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
+                cv2.cvtColor(self._preview_resized, cv2.COLOR_BGR2RGB, dst=self._preview_rgb)
+                # Wrap the contiguous RGB buffer as a Pygame surface (no copy or transpose)
+                frame_surface = pygame.image.frombuffer(self._preview_rgb, (preview_w, preview_h), "RGB")
                 self.screen.blit(frame_surface, (preview_x, preview_y))
             except Exception as e:
                 # Fallback if frame conversion fails
-                error_text = self.font_small.render("Camera Error", True, self.RED)
-                self.screen.blit(error_text, (preview_x + 5, preview_y + 5))
+                self.screen.blit(self._camera_error_surf, (preview_x + 5, preview_y + 5))
         
         # Draw confidence indicator overlay
         if confidence > 0:
-            conf_text = self.font_small.render(f"Conf: {confidence:.2f}", True, self.WHITE)
+            conf_text = self._render_cached(self.font_small, f"Conf: {confidence:.2f}", self.WHITE)
             # Draw semi-transparent background for text
-            text_bg = pygame.Surface((conf_text.get_width() + 10, conf_text.get_height() + 4))
-            text_bg.set_alpha(180)
-            text_bg.fill(self.BLACK)
-            self.screen.blit(text_bg, (preview_x + 5, preview_y + preview_h - 25))
+            self.screen.blit(self._text_bg(conf_text), (preview_x + 5, preview_y + preview_h - 25))
             self.screen.blit(conf_text, (preview_x + 7, preview_y + preview_h - 23))
         
         # Draw detection status
         if head_pos is not None:
-            status_text = self.font_small.render("HEAD DETECTED", True, self.GREEN)
+            status_text, status_bg = self._head_detected_surf, self._head_detected_bg
         else:
-            status_text = self.font_small.render("NO HEAD", True, self.RED)
+            status_text, status_bg = self._no_head_surf, self._no_head_bg
         
-        status_bg = pygame.Surface((status_text.get_width() + 10, status_text.get_height() + 4))
-        status_bg.set_alpha(180)
-        status_bg.fill(self.BLACK)
         self.screen.blit(status_bg, (preview_x + 5, preview_y + 5))
         self.screen.blit(status_text, (preview_x + 7, preview_y + 7))
+        
+        return preview_rect
     
     def _draw_score(self, score):
-        """Draw score"""
-        score_text = self.font_medium.render(f"Score: {score}", True, self.WHITE)
-        self.screen.blit(score_text, (self.window_width - 150, 10))
+        """Draw score; returns the drawn rect"""
+        score_text = self._render_cached(self.font_medium, f"Score: {score}", self.WHITE)
+        return self.screen.blit(score_text, (self.window_width - 150, 10))
     
     def _draw_direction_indicator(self, direction):
-        """Draw current direction indicator"""
-        if direction:
-            dir_text = self.font_small.render(f"Direction: {direction}", True, self.YELLOW)
-            self.screen.blit(dir_text, (self.window_width - 200, 50))
+        """Draw current direction indicator; returns the drawn rect, or None"""
+        if direction is not None:
+            dir_text = self._render_cached(self.font_small, f"Direction: {DIRECTION_NAMES[direction]}", self.YELLOW)
+            return self.screen.blit(dir_text, (self.window_width - 200, 50))
+        return None
     
     def _draw_boost_indicator(self, boost_active):
-        """Draw boost indicator"""
+        """Draw boost indicator; returns the drawn rect, or None"""
         if boost_active:
-            boost_text = self.font_small.render("BOOST ACTIVE!", True, self.RED)
-            self.screen.blit(boost_text, (self.window_width - 200, 80))
+            return self.screen.blit(self._boost_surf, (self.window_width - 200, 80))
+        return None
     
     def _draw_pause_overlay(self):
         """Draw pause overlay"""
-        overlay = pygame.Surface((self.window_width, self.window_height))
-        overlay.set_alpha(128)
-        overlay.fill(self.BLACK)
-        self.screen.blit(overlay, (0, 0))
-        
-        pause_text = self.font_large.render("PAUSED", True, self.WHITE)
-        text_rect = pause_text.get_rect(center=(self.window_width // 2, self.window_height // 2))
-        self.screen.blit(pause_text, text_rect)
-        
-        hint_text = self.font_small.render("Close your fist to unpause", True, self.GRAY)
-        hint_rect = hint_text.get_rect(center=(self.window_width // 2, self.window_height // 2 + 50))
-        self.screen.blit(hint_text, hint_rect)
+        self.screen.blits(self._pause_overlay, doreturn=False)
     
     def _draw_game_over_overlay(self, score):
         """Draw game over overlay"""
-        overlay = pygame.Surface((self.window_width, self.window_height))
-        overlay.set_alpha(200)
-        overlay.fill(self.BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blits(self._game_over_overlay, doreturn=False)
         
-        game_over_text = self.font_large.render("GAME OVER", True, self.RED)
-        text_rect = game_over_text.get_rect(center=(self.window_width // 2, self.window_height // 2 - 50))
-        self.screen.blit(game_over_text, text_rect)
-        
-        score_text = self.font_medium.render(f"Final Score: {score}", True, self.WHITE)
+        # Only the score line changes; its surface comes from the text cache
+        score_text = self._render_cached(self.font_medium, f"Final Score: {score}", self.WHITE)
         score_rect = score_text.get_rect(center=(self.window_width // 2, self.window_height // 2))
         self.screen.blit(score_text, score_rect)
-        
-        restart_text = self.font_small.render("Press SPACE to restart", True, self.GRAY)
-        restart_rect = restart_text.get_rect(center=(self.window_width // 2, self.window_height // 2 + 50))
-        self.screen.blit(restart_text, restart_rect)
     
-    def draw_calibration(self, frame, countdown):
+    def draw_calibration(self, frame, countdown, head_pos=None):
         """
         Draw calibration screen
         
         Args:
             frame: Camera frame
             countdown: Countdown seconds remaining
+            head_pos: Current head position, or None if no head is detected
         """
         self.screen.fill(self.BLACK)
+        # The game screen repaints the whole window once calibration ends
+        self._needs_full_redraw = True
         
         # Convert OpenCV frame to Pygame surface if available
         if frame is not None:
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_small = cv2.resize(frame_rgb, (640, 480))
-            frame_surface = pygame.surfarray.make_surface(frame_small.swapaxes(0, 1))
-            self.screen.blit(frame_surface, 
-                           ((self.window_width - 640) // 2, (self.window_height - 480) // 2))
+            # Resize first so the color conversion runs on the fixed-size buffer
+            calib_w, calib_h = self.calibration_size
+            cv2.resize(frame, (calib_w, calib_h), dst=self._calib_resized,
+                       interpolation=cv2.INTER_LINEAR)
+            cv2.cvtColor(self._calib_resized, cv2.COLOR_BGR2RGB, dst=self._calib_rgb)
+            frame_surface = pygame.image.frombuffer(self._calib_rgb, (calib_w, calib_h), "RGB")
+            frame_x = (self.window_width - calib_w) // 2
+            frame_y = (self.window_height - calib_h) // 2
+            self.screen.blit(frame_surface, (frame_x, frame_y))
+            
+            # Draw detection status on the camera view
+            if head_pos is not None:
+                status_text, status_bg = self._head_detected_surf, self._head_detected_bg
+            else:
+                status_text, status_bg = self._no_head_surf, self._no_head_bg
+            self.screen.blit(status_bg, (frame_x + 5, frame_y + 5))
+            self.screen.blit(status_text, (frame_x + 7, frame_y + 7))
         
         # Draw calibration text
-        calib_text = self.font_large.render("CALIBRATION", True, self.WHITE)
-        text_rect = calib_text.get_rect(center=(self.window_width // 2, 50))
-        self.screen.blit(calib_text, text_rect)
+        text_rect = self._calib_surf.get_rect(center=(self.window_width // 2, 50))
+        self.screen.blit(self._calib_surf, text_rect)
         
-        instruction_text = self.font_medium.render(
-            "Hold your hand still in front of the camera", True, self.YELLOW)
-        inst_rect = instruction_text.get_rect(center=(self.window_width // 2, 100))
-        self.screen.blit(instruction_text, inst_rect)
+        inst_rect = self._calib_hint_surf.get_rect(center=(self.window_width // 2, 100))
+        self.screen.blit(self._calib_hint_surf, inst_rect)
         
-        countdown_text = self.font_large.render(str(countdown), True, self.GREEN)
+        countdown_text = self._render_cached(self.font_large, str(countdown), self.GREEN)
         countdown_rect = countdown_text.get_rect(center=(self.window_width // 2, self.window_height // 2))
         self.screen.blit(countdown_text, countdown_rect)
         
@@ -1,28 +1,117 @@
 """
 Vision Module: Handles webcam input and YOLOv8 pose detection for head tracking
 """
+import os
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import cv2
 import numpy as np
 import torch
 from ultralytics import YOLO
-from collections import deque
+from keypoints import KP_NOSE, KP_LEFT_EYE, KP_RIGHT_EYE, N_KP
+
+# Capture resolution requested from the camera
+FRAME_SHAPE = (480, 640, 3)
+
+
+def _open_capture(camera_id):
+    """Open camera_id with the capture settings shared by the thread and process paths"""
+    cap = cv2.VideoCapture(camera_id)
+    if not cap.isOpened():
+        raise RuntimeError(f"Failed to open camera {camera_id}")
+    
+    # Set camera properties for better performance
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_SHAPE[1])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_SHAPE[0])
+    cap.set(cv2.CAP_PROP_FPS, 30)
+    # Keep only the newest frame in the driver queue so reads are never stale
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
+def _capture_worker(camera_id, shm_name, frame_seq, slot_locks, ready, stop):
+    """
+    Capture process: write camera frames into a two-slot shared-memory ring
+    
+    Frame number s lives in slot s % 2. The next frame is written into
+    the other slot under its lock, then frame_seq is incremented, so the
+    reader never sees a half-written frame.
+    
+    Args:
+        camera_id: Camera index to capture from
+        shm_name: Name of the shared memory block holding the two slots
+        frame_seq: Shared counter of frames written
+        slot_locks: One lock per slot
+        ready: Event set once the first frame is available
+        stop: Event that ends the capture loop
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    slots = np.ndarray((2,) + FRAME_SHAPE, dtype=np.uint8, buffer=shm.buf)
+    cap = _open_capture(camera_id)
+    try:
+        while not stop.is_set():
+            ret, frame = cap.read()
+            if not ret or frame is None:
+                # Keep the last good frame and back off instead of spinning on a lost camera
+                stop.wait(0.01)
+                continue
+            slot = (frame_seq.value + 1) % 2
+            with slot_locks[slot]:
+                if frame.shape == FRAME_SHAPE:
+                    np.copyto(slots[slot], frame)
+                else:
+                    cv2.resize(frame, (FRAME_SHAPE[1], FRAME_SHAPE[0]), dst=slots[slot])
+            frame_seq.value += 1
+            ready.set()
+    finally:
+        cap.release()
+        del slots
+        shm.close()
 
 
 class VisionModule:
-    def __init__(self, camera_id=0, model_size='s', smoothing_window=5):
+    def __init__(self, camera_id=0, model_size='s', smoothing_window=5, imgsz=320, use_onnx=True,
+                 infer_every=2, debug_draw=False, capture_process=False):
         """
         Initialize vision module with YOLOv8 pose model for head tracking
         
         Args:
             camera_id: Webcam device ID (default 0)
             model_size: Model size ('n', 's', 'm', 'l', 'x') - 's' recommended
-            smoothing_window: Number of frames for rolling average smoothing
+            smoothing_window: Smoothing span in frames; exponential moving average
+                with alpha = 2 / (smoothing_window + 1)
+            imgsz: Inference image size (long side, multiple of 32)
+            use_onnx: On CPU, run an ONNX Runtime export of the model instead of PyTorch
+            infer_every: Run the pose model on every Nth frame, reusing the last
+                detection in between (every frame while the head moves fast)
+            debug_draw: Draw the full YOLOv8 skeleton and boxes on the camera frame
+            capture_process: Capture in a separate process that shares frames
+                through shared memory, instead of a background thread
         """
         self.camera_id = camera_id
         self.model_size = model_size
         self.cap = None
         self.model = None
         self.device = 'cpu'  # Will be set to 'cuda' if GPU available
+        self.half = False  # FP16 inference, enabled on CUDA
+        self.imgsz = imgsz
+        self.use_onnx = use_onnx
+        self.infer_every = infer_every
+        self.debug_draw = debug_draw
+        self.capture_process = capture_process
+        
+        # Inference frame skipping: fall back to every frame when the raw head
+        # position jumps more than fast_motion_threshold pixels between detections
+        self.fast_motion_threshold = 15
+        self._frame_counter = 0
+        self._fast_motion = False
+        self._last_result = None
+        # Whether the last detect_hand result came from a new inference
+        self._detection_fresh = False
+        # Raw head position circled on the last inference frame, or None
+        self._circle_head = None
         self.smoothing_window = smoothing_window
         
         # COCO pose keypoint indices for head
@@ -31,13 +120,55 @@ class VisionModule:
         self.LEFT_EYE = 1
         self.RIGHT_EYE = 2
         
-        # Smoothing buffers
-        self.head_history = deque(maxlen=smoothing_window)
-        self.keypoints_history = deque(maxlen=smoothing_window)
+        # Background capture thread and its single-slot latest-frame buffer
+        self._capture_thread = None
+        self._capture_lock = threading.Lock()
+        self._capture_stop = threading.Event()
+        self._frame_ready = threading.Event()
+        self._latest_frame = None
+        self._last_frame = None
+        
+        # Capture process state (capture_process=True)
+        self._capture_proc = None
+        self._shm = None
+        self._shm_slots = None
+        self._shm_seq = None
+        self._shm_locks = None
+        self._shm_ready = None
+        self._shm_stop = None
+        self._shm_read_seq = 0
+        
+        # CUDA input path: letterboxed frame staged in pinned host memory
+        # (allocated on the first CUDA frame)
+        self._letterbox = None
+        self._pinned = None
+        self._pinned_np = None
+        self._gpu_input = None
+        self._input_shape = None
+        self._resized_shape = None
+        self._input_scale = 1.0
+        self._input_pad = (0, 0)
+        
+        # Reusable buffer for the mirrored display frame
+        self._mirror_buf = None
+        
+        # Per-frame keypoint buffers, filled in place by detect_hand
+        self._kp_buf = np.zeros((N_KP, 2), dtype=np.float32)
+        self._kp_valid = np.zeros(N_KP, dtype=np.uint8)
+        
+        # Exponential moving average smoothing state. A keypoint row stays valid
+        # until it has gone unseen for smoothing_window detections
+        self._alpha = 2.0 / (smoothing_window + 1)
+        self._ema_head = None
+        self._last_raw_head = None
+        self._ema_kp = np.zeros((N_KP, 2), dtype=np.float32)
+        self._ema_kp_valid = np.zeros(N_KP, dtype=np.uint8)
+        self._kp_age = np.full(N_KP, smoothing_window, dtype=np.int32)
         
         # Current detection state
         self.current_head = None
         self.current_keypoints = None
+        self.current_keypoints_valid = None
         self.detection_confidence = 0.0
         
     def _find_available_camera(self, start_index=0, max_tries=5):
@@ -54,32 +185,53 @@ class VisionModule:
         print("Searching for available camera...")
         
         # Try the specified camera_id first
-        if start_index >= 0:
-            cap = cv2.VideoCapture(start_index)
-            if cap.isOpened():
-                ret, frame = cap.read()
-                if ret and frame is not None:
-                    cap.release()
-                    print(f"Found camera at index {start_index}")
-                    return start_index
-                cap.release()
-        
-        # Try other indices
-        for i in range(max_tries):
-            if i == start_index:
-                continue
-            print(f"Trying camera index {i}...")
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                ret, frame = cap.read()
-                if ret and frame is not None:
-                    cap.release()
+        if start_index >= 0 and self._try_open(start_index):
+            print(f"Found camera at index {start_index}")
+            return start_index
+        
+        # Probe the other indices concurrently; a missing device can stall for seconds
+        candidates = [i for i in range(max_tries) if i != start_index]
+        if not candidates:
+            return None
+        print(f"Trying camera indices {candidates}...")
+        executor = ThreadPoolExecutor(max_workers=len(candidates))
+        futures = {}
+        try:
+            futures = {executor.submit(self._try_open, i): i for i in candidates}
+            for future in as_completed(futures):
+                if future.result():
+                    i = futures[future]
                     print(f"Found camera at index {i}")
                     return i
-                cap.release()
+        finally:
+            # Don't wait for slow probes; each releases its own capture.
+            # (Cancelled by hand: shutdown's cancel_futures needs Python 3.9)
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
         
         return None
     
+    @staticmethod
+    def _try_open(index):
+        """
+        Check whether the camera at index opens and delivers a frame
+        
+        Args:
+            index: Camera index to probe
+            
+        Returns:
+            bool: True if a frame was read
+        """
+        cap = cv2.VideoCapture(index)
+        try:
+            if cap.isOpened():
+                ret, frame = cap.read()
+                return ret and frame is not None
+            return False
+        finally:
+            cap.release()
+    
     def initialize(self, auto_detect=True):
         """
         Initialize camera and YOLOv8 pose model
@@ -95,10 +247,20 @@ class VisionModule:
         # Set device to GPU if available
         if torch.cuda.is_available():
             self.device = 'cuda'
-            print(f"Using GPU: {torch.cuda.get_device_name(0)}")
+            self.half = True
+            print(f"Using GPU: {torch.cuda.get_device_name(0)} (FP16)")
         else:
             self.device = 'cpu'
+            self.half = False
             print("Using CPU (GPU not available)")
+        self.model.to(self.device)
+        
+        # On CPU, ONNX Runtime's fused graph is much faster than eager PyTorch
+        if self.device == 'cpu' and self.use_onnx:
+            self._load_onnx_model(model_name)
+        
+        # Warm up: builds the predictor once so detection can call it directly
+        self._predict(np.zeros(FRAME_SHAPE, dtype=np.uint8))
         
         # Auto-detect camera if enabled
         if auto_detect:
@@ -126,46 +288,175 @@ class VisionModule:
                 )
             self.cap.release()
         
-        # Initialize webcam with found index
-        self.cap = cv2.VideoCapture(self.camera_id)
-        if not self.cap.isOpened():
-            raise RuntimeError(f"Failed to open camera {self.camera_id}")
-        
-        # Set camera properties for better performance
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        self.cap.set(cv2.CAP_PROP_FPS, 30)
+        if self.capture_process:
+            self._start_capture_process()
+        else:
+            # Initialize webcam with found index
+            self.cap = _open_capture(self.camera_id)
+            
+            # Read frames on a background thread so capture overlaps inference
+            self._capture_stop.clear()
+            self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+            self._capture_thread.start()
         
         print(f"Camera initialized successfully at index {self.camera_id}")
+    
+    def _start_capture_process(self):
+        """Start the capture process and map its two-slot shared-memory frame ring"""
+        self._shm = shared_memory.SharedMemory(create=True, size=2 * int(np.prod(FRAME_SHAPE)))
+        self._shm_slots = np.ndarray((2,) + FRAME_SHAPE, dtype=np.uint8, buffer=self._shm.buf)
+        self._shm_seq = multiprocessing.Value('q', 0, lock=False)
+        self._shm_locks = (multiprocessing.Lock(), multiprocessing.Lock())
+        self._shm_ready = multiprocessing.Event()
+        self._shm_stop = multiprocessing.Event()
+        self._shm_read_seq = 0
+        self._capture_proc = multiprocessing.Process(
+            target=_capture_worker,
+            args=(self.camera_id, self._shm.name, self._shm_seq, self._shm_locks,
+                  self._shm_ready, self._shm_stop),
+            daemon=True)
+        self._capture_proc.start()
         
+        # Wait for the first frame; a worker that dies or never delivers
+        # fails startup the same way the capture thread path does
+        for _ in range(50):
+            if self._shm_ready.wait(timeout=0.1):
+                return
+            if not self._capture_proc.is_alive():
+                break
+        self._stop_capture_process()
+        raise RuntimeError(f"Failed to open camera {self.camera_id} in the capture process")
+    
+    def _stop_capture_process(self):
+        """Stop the capture process and free its shared memory"""
+        self._shm_stop.set()
+        self._capture_proc.join(timeout=2.0)
+        if self._capture_proc.is_alive():
+            self._capture_proc.terminate()
+        self._capture_proc = None
+        self._shm_slots = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+    
+    def _capture_loop(self):
+        """Capture thread: keep the newest camera frame in the latest-frame slot"""
+        while not self._capture_stop.is_set():
+            ret, frame = self.cap.read()
+            if not ret or frame is None:
+                # Keep the last good frame and back off instead of spinning on a lost camera
+                self._capture_stop.wait(0.01)
+                continue
+            with self._capture_lock:
+                self._latest_frame = frame
+            self._frame_ready.set()
+        
+    def _load_onnx_model(self, model_name):
+        """
+        Swap the PyTorch model for an ONNX Runtime export, keeping PyTorch on failure
+        
+        The export is written next to the .pt weights on first use and
+        reused afterwards; delete it after changing imgsz. Ultralytics only
+        creates the ONNX Runtime session on the first predict, so a warm-up
+        inference runs here to catch a missing or broken onnxruntime.
+        
+        Args:
+            model_name: PyTorch weights file the export is derived from
+        """
+        onnx_path = os.path.splitext(model_name)[0] + '.onnx'
+        torch_model = self.model
+        try:
+            if not os.path.exists(onnx_path):
+                print(f"Exporting {model_name} to ONNX (one-time)...")
+                onnx_path = self.model.export(format='onnx', imgsz=self.imgsz, opset=17, simplify=True)
+            self.model = YOLO(onnx_path, task='pose')
+            self._predict(np.zeros(FRAME_SHAPE, dtype=np.uint8))
+            print(f"Using ONNX Runtime model: {onnx_path}")
+        except Exception as e:
+            self.model = torch_model
+            print(f"ONNX Runtime unavailable, using PyTorch on CPU: {e}")
+    
     def get_frame(self):
-        """Capture and return current frame (mirrored horizontally)"""
-        ret, frame = self.cap.read()
-        if not ret:
+        """
+        Return the newest captured frame, unmirrored, without waiting on the camera
+        
+        The same frame object is returned until the capture thread reads a
+        new one; callers must not modify it. The horizontal mirror is applied
+        by detect_hand: to keypoint coordinates and to the display frame only,
+        never to the model input.
+        """
+        if self._capture_proc is not None:
+            return self._read_shared_frame()
+        
+        # Only the first call waits, for the capture thread's first frame
+        self._frame_ready.wait(timeout=1.0)
+        with self._capture_lock:
+            return self._latest_frame
+    
+    def _read_shared_frame(self):
+        """Copy the newest frame out of the shared-memory ring, once per new frame"""
+        if not self._shm_ready.wait(timeout=1.0):
             return None
-        # Flip frame horizontally to fix mirroring
-        frame = cv2.flip(frame, 1)
-        return frame
+        seq = self._shm_seq.value
+        if seq != self._shm_read_seq:
+            slot = seq % 2
+            with self._shm_locks[slot]:
+                self._latest_frame = self._shm_slots[slot].copy()
+            self._shm_read_seq = seq
+        return self._latest_frame
+    
+    def _mirror(self, image):
+        """Mirror an image horizontally into the reusable display buffer"""
+        if self._mirror_buf is None or self._mirror_buf.shape != image.shape:
+            self._mirror_buf = np.empty_like(image)
+        return cv2.flip(image, 1, dst=self._mirror_buf)
     
     def detect_hand(self, frame):
         """
         Detect head position using YOLOv8 pose (kept name for compatibility)
         
         Args:
-            frame: Input frame from webcam
+            frame: Unmirrored input frame from get_frame
             
         Returns:
-            tuple: (head_position, keypoints_dict, confidence, annotated_frame)
+            tuple: (head_position, keypoints, keypoints_valid, confidence, annotated_frame)
+                Positions and annotated_frame are mirrored horizontally.
+                keypoints is an (N_KP, 2) float32 array laid out as in keypoints.py
+                and keypoints_valid its uint8 mask; both are None without a detection
         """
         if frame is None:
-            return None, None, 0.0, None
+            return None, None, None, 0.0, None
+        
+        # The capture thread has not delivered a new frame since the last call
+        if frame is self._last_frame and self._last_result is not None:
+            return self._last_result
+        self._last_frame = frame
         
-        # Run YOLOv8 pose detection with GPU acceleration
-        results = self.model(frame, device=self.device, verbose=False)
+        # Reuse the last detection on skipped frames unless the head is moving fast
+        self._frame_counter += 1
+        if (self._last_result is not None and not self._fast_motion and
+                self._frame_counter % self.infer_every != 0):
+            # Keep the preview live: fresh display frame, last detection's circle
+            annotated_frame = self._mirror(frame)
+            self._draw_head(annotated_frame, self._circle_head)
+            self._last_result = self._last_result[:4] + (annotated_frame,)
+            self._detection_fresh = False
+            return self._last_result
+        
+        self._detection_fresh = True
+        self._last_result = self._detect(frame)
+        return self._last_result
+    
+    def _detect(self, frame):
+        """Run the pose model on frame; returns the same tuple as detect_hand"""
+        # Run YOLOv8 pose detection with GPU acceleration (FP16 on CUDA, small input size)
+        results = self._predict(frame)
         
         head_pos = None
-        keypoints = {}
         confidence = 0.0
+        frame_width = frame.shape[1]
+        self._circle_head = None
+        self._kp_valid[:] = 0
         
         if len(results) > 0 and results[0].keypoints is not None:
             # Check if keypoints data exists and has elements
@@ -173,128 +464,210 @@ class VisionModule:
                 keypoints_data_array = results[0].keypoints.data
                 if keypoints_data_array is None or len(keypoints_data_array) == 0:
                     # No detections
-                    annotated_frame = results[0].plot() if len(results) > 0 else frame.copy()
-                    return None, None, 0.0, annotated_frame
+                    annotated_frame = self._display_frame(frame, results)
+                    return None, None, None, 0.0, annotated_frame
                 
                 keypoints_data = keypoints_data_array[0]  # First person detected
                 
                 # Verify keypoints_data has valid shape
                 if keypoints_data is None or keypoints_data.shape[0] <= self.NOSE:
                     # Create annotated frame even without detection
-                    annotated_frame = results[0].plot() if len(results) > 0 else frame.copy()
-                    return None, None, 0.0, annotated_frame
+                    annotated_frame = self._display_frame(frame, results)
+                    return None, None, None, 0.0, annotated_frame
             except (IndexError, AttributeError, TypeError) as e:
                 # Handle any indexing errors gracefully
-                annotated_frame = results[0].plot() if len(results) > 0 else frame.copy()
-                return None, None, 0.0, annotated_frame
+                annotated_frame = self._display_frame(frame, results)
+                return None, None, None, 0.0, annotated_frame
             
             # Extract head keypoints (nose position)
             if keypoints_data.shape[0] > self.NOSE:
+                # Copy the head rows to the host in one transfer (one device sync on GPU)
+                head_kps = keypoints_data[:self.RIGHT_EYE + 1].cpu().numpy()
+                if self.device == 'cuda':
+                    # Map from letterboxed model input back to frame coordinates
+                    head_kps[:, 0] = (head_kps[:, 0] - self._input_pad[0]) / self._input_scale
+                    head_kps[:, 1] = (head_kps[:, 1] - self._input_pad[1]) / self._input_scale
+                
                 # Get nose position (head center)
-                nose = keypoints_data[self.NOSE].cpu().numpy()
+                nose = head_kps[self.NOSE]
                 if nose[2] > 0.3:  # Confidence threshold
-                    head_pos = (int(nose[0]), int(nose[1]))
+                    # Mirror x to match the displayed (flipped) view
+                    head_pos = (int(frame_width - nose[0]), int(nose[1]))
                     confidence = nose[2]
                     
                     # Extract other head keypoints for visualization
-                    keypoints['head'] = head_pos
-                    keypoints['nose'] = head_pos
-                    keypoints['left_eye'] = self._get_keypoint(keypoints_data, self.LEFT_EYE)
-                    keypoints['right_eye'] = self._get_keypoint(keypoints_data, self.RIGHT_EYE)
+                    self._kp_buf[KP_NOSE] = head_pos
+                    self._kp_valid[KP_NOSE] = 1
+                    self._set_keypoint(head_kps, self.LEFT_EYE, KP_LEFT_EYE, frame_width)
+                    self._set_keypoint(head_kps, self.RIGHT_EYE, KP_RIGHT_EYE, frame_width)
         
-        # Create annotated frame with bounding boxes and keypoints
-        try:
-            if len(results) > 0:
-                # Use YOLOv8's built-in plotting for bounding boxes and skeleton
-                annotated_frame = results[0].plot()
-            else:
-                annotated_frame = frame.copy()
-        except Exception:
-            annotated_frame = frame.copy()
+        # Mirrored copy of the frame to draw the head overlays on
+        annotated_frame = self._display_frame(frame, results)
         
-        # Draw additional head visualization
-        if head_pos is not None:
-            # Draw head position circle
-            cv2.circle(annotated_frame, head_pos, 15, (0, 255, 0), -1)
-            cv2.circle(annotated_frame, head_pos, 20, (0, 255, 0), 2)
-            
-            # Add text overlay showing head detected
-            cv2.putText(annotated_frame, "HEAD DETECTED", (10, 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            cv2.putText(annotated_frame, f"Confidence: {confidence:.2f}", (10, 60),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-            cv2.putText(annotated_frame, "Move your head to control", (10, 90),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-        else:
-            # Show no head detected message
-            cv2.putText(annotated_frame, "NO HEAD DETECTED", (10, 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-            cv2.putText(annotated_frame, "Face the camera", (10, 60),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
+        # Draw head position circle; detection status text is drawn by the UI
+        self._circle_head = head_pos
+        self._draw_head(annotated_frame, head_pos)
+        
+        # Detection jumped: infer every frame until the head settles
+        if head_pos is not None and self._last_raw_head is not None:
+            last_x, last_y = self._last_raw_head
+            self._fast_motion = max(abs(head_pos[0] - last_x),
+                                    abs(head_pos[1] - last_y)) > self.fast_motion_threshold
         
         # Apply smoothing
         if head_pos is not None:
-            self.head_history.append(head_pos)
-            self.keypoints_history.append(keypoints)
+            self._last_raw_head = head_pos
+            if self._ema_head is None:
+                self._ema_head = (float(head_pos[0]), float(head_pos[1]))
+            else:
+                a = self._alpha
+                self._ema_head = (self._ema_head[0] + a * (head_pos[0] - self._ema_head[0]),
+                                  self._ema_head[1] + a * (head_pos[1] - self._ema_head[1]))
             
             # Use smoothed position
-            if len(self.head_history) > 0:
-                smoothed_head = np.mean(self.head_history, axis=0)
-                self.current_head = (int(smoothed_head[0]), int(smoothed_head[1]))
-                self.current_keypoints = self._smooth_keypoints()
-                self.detection_confidence = confidence
-        else:
-            # No detection - use last known position if available
-            if len(self.head_history) > 0:
-                self.current_head = tuple(self.head_history[-1])
-                self.current_keypoints = self.keypoints_history[-1] if len(self.keypoints_history) > 0 else None
-                self.detection_confidence = 0.0
+            self.current_head = (int(self._ema_head[0]), int(self._ema_head[1]))
+            self.current_keypoints, self.current_keypoints_valid = self._smooth_keypoints()
+            self.detection_confidence = confidence
+        elif self._ema_head is not None:
+            # No detection - hold the last smoothed position
+            self.detection_confidence = 0.0
+        
+        return (self.current_head, self.current_keypoints, self.current_keypoints_valid,
+                self.detection_confidence, annotated_frame)
+    
+    def _predict(self, frame):
+        """
+        Run the pose model on frame
+        
+        The first call goes through model.predict, which validates the
+        arguments and builds the predictor; later calls invoke the cached
+        predictor directly with the same settings.
+        
+        Args:
+            frame: Unmirrored BGR input frame
+        """
+        if self.device == 'cuda':
+            return self._predict_cuda(frame)
+        return self._run_predictor(frame)
+    
+    def _run_predictor(self, source):
+        """Call the cached predictor, building it via model.predict on first use"""
+        if self.model.predictor is None:
+            return self.model.predict(source, device=self.device, half=self.half,
+                                      imgsz=self.imgsz, conf=0.3, verbose=False)
+        return self.model.predictor(source)
+    
+    def _predict_cuda(self, frame):
+        """
+        Run the pose model on a letterboxed BCHW tensor uploaded from pinned memory
+        
+        Keypoints in the results are in model input coordinates; map them
+        back with _input_scale and _input_pad.
+        
+        Args:
+            frame: Unmirrored BGR input frame
+        """
+        h, w = frame.shape[:2]
+        if self._letterbox is None or self._input_shape != (h, w):
+            self._init_cuda_input(h, w)
+        
+        # Letterbox on the CPU, then BGR->RGB, HWC->CHW and scale to 0-1 into pinned memory
+        top, left = self._input_pad[1], self._input_pad[0]
+        nh, nw = self._resized_shape
+        cv2.resize(frame, (nw, nh), dst=self._letterbox[top:top + nh, left:left + nw],
+                   interpolation=cv2.INTER_LINEAR)
+        np.multiply(self._letterbox[:, :, ::-1].transpose(2, 0, 1), 1.0 / 255.0,
+                    out=self._pinned_np, casting='unsafe')
+        
+        # Asynchronous upload on the current stream, so inference is ordered after
+        # it. Reading the keypoints back with .cpu() waits on that stream, so the
+        # pinned buffer is free again before the next frame is written into it
+        self._gpu_input.copy_(self._pinned, non_blocking=True)
+        return self._run_predictor(self._gpu_input)
+    
+    def _init_cuda_input(self, h, w):
+        """Allocate the letterbox, pinned host and device input buffers for h x w frames"""
+        scale = self.imgsz / max(h, w)
+        nh, nw = int(round(h * scale)), int(round(w * scale))
+        # Pad each side up to a multiple of the model stride (32)
+        ph, pw = -(-nh // 32) * 32, -(-nw // 32) * 32
+        
+        self._input_shape = (h, w)
+        self._resized_shape = (nh, nw)
+        self._input_scale = scale
+        self._input_pad = ((pw - nw) // 2, (ph - nh) // 2)
+        self._letterbox = np.full((ph, pw, 3), 114, dtype=np.uint8)
         
-        return self.current_head, self.current_keypoints, self.detection_confidence, annotated_frame
+        dtype = torch.float16 if self.half else torch.float32
+        self._pinned = torch.empty((1, 3, ph, pw), dtype=dtype, pin_memory=True)
+        self._pinned_np = self._pinned.numpy()[0]
+        self._gpu_input = torch.empty((1, 3, ph, pw), dtype=dtype, device=self.device)
     
-    def _get_keypoint(self, keypoints_data, index):
-        """Extract keypoint if confidence is sufficient"""
-        if keypoints_data.shape[0] > index:
-            kp = keypoints_data[index].cpu().numpy()
+    @staticmethod
+    def _draw_head(annotated_frame, head_pos):
+        """Circle the head position on the display frame, if there is one"""
+        if head_pos is not None:
+            cv2.circle(annotated_frame, head_pos, 15, (0, 255, 0), -1)
+            cv2.circle(annotated_frame, head_pos, 20, (0, 255, 0), 2)
+    
+    def _display_frame(self, frame, results):
+        """Get the mirrored display frame; plots the full skeleton only with debug_draw"""
+        # The plot is at model input size on the CUDA tensor path
+        if self.debug_draw and len(results) > 0 and results[0].orig_shape == frame.shape[:2]:
+            try:
+                # Use YOLOv8's built-in plotting for bounding boxes and skeleton
+                return self._mirror(results[0].plot(labels=False))
+            except Exception:
+                pass
+        return self._mirror(frame)
+    
+    def _set_keypoint(self, head_kps, index, slot, frame_width):
+        """Copy a host-side head keypoint (x mirrored) into the keypoint buffer if confidence is sufficient"""
+        if head_kps.shape[0] > index:
+            kp = head_kps[index]
             if kp[2] > 0.3:  # Confidence threshold
-                return (int(kp[0]), int(kp[1]))
-        return None
+                self._kp_buf[slot] = (int(frame_width - kp[0]), int(kp[1]))
+                self._kp_valid[slot] = 1
     
     def _smooth_keypoints(self):
-        """Average keypoints over smoothing window"""
-        if len(self.keypoints_history) == 0:
-            return None
+        """Fold this frame's keypoint buffer into the per-row EMA; returns (array, mask) updated in place"""
+        seen = self._kp_valid.astype(bool)
         
-        # Average positions for each keypoint
-        smoothed = {}
-        for key in ['head', 'nose', 'left_eye', 'right_eye']:
-            positions = []
-            for kp_dict in self.keypoints_history:
-                if kp_dict and key in kp_dict and kp_dict[key] is not None:
-                    positions.append(kp_dict[key])
-            
-            if len(positions) > 0:
-                avg_pos = np.mean(positions, axis=0)
-                smoothed[key] = (int(avg_pos[0]), int(avg_pos[1]))
-            else:
-                smoothed[key] = None
+        # Rows seen again after expiring restart from the new value
+        restart = seen & (self._kp_age >= self.smoothing_window)
+        self._ema_kp[seen] += self._alpha * (self._kp_buf[seen] - self._ema_kp[seen])
+        self._ema_kp[restart] = self._kp_buf[restart]
+        
+        self._kp_age += 1
+        self._kp_age[seen] = 0
+        np.less(self._kp_age, self.smoothing_window, out=self._ema_kp_valid, casting='unsafe')
         
-        return smoothed
+        return self._ema_kp, self._ema_kp_valid
     
     def get_wrist_position(self):
         """Get current smoothed head position (kept name for compatibility)"""
         return self.current_head
     
     def get_keypoints(self):
-        """Get current smoothed keypoints"""
-        return self.current_keypoints
+        """Get current smoothed keypoints array and its validity mask"""
+        return self.current_keypoints, self.current_keypoints_valid
+    
+    def is_detection_fresh(self):
+        """Whether the last detect_hand call ran inference rather than reusing the last detection"""
+        return self._detection_fresh
     
     def get_confidence(self):
         """Get detection confidence"""
         return self.detection_confidence
     
     def release(self):
-        """Release camera resources"""
+        """Stop the capture thread and release camera resources"""
+        self._capture_stop.set()
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=1.0)
+            self._capture_thread = None
+        if self._capture_proc is not None:
+            self._stop_capture_process()
         if self.cap is not None:
             self.cap.release()
         cv2.destroyAllWindows()